@@ -3,14 +3,45 @@ Module 5: Professional Dashboard Frontend
 Flask web application with comprehensive analytics dashboard
 """
 from flask import Flask, render_template, request, jsonify
+from collections import OrderedDict
 import json
-from stress_predictor import StressLevelPredictor
+import math
+import threading
+import time
+import numpy as np
+import orjson
+import pandas as pd
+from stress_predictor import StressLevelPredictor, FEATURE_NAMES, PARALLEL_PREDICT_MIN_ROWS
 from burnout_engine import BurnoutEngine
 from phishing_risk import PhishingRiskEngine
 from llm_explainer import LLMExplainer
 
 app = Flask(__name__)
 
+# Maximum number of distinct analyses kept in memory, and seconds each is reused
+ANALYSIS_CACHE_SIZE = 4096
+ANALYSIS_CACHE_TTL = 3600
+
+# Risk factor breakdown fields of a phishing result
+PHISHING_RISK_FACTORS = (
+    'stress_contribution',
+    'burnout_contribution',
+    'cognitive_load',
+    'awareness_vulnerability'
+)
+
+# Type and fallback value for each stress predictor feature
+FEATURE_DEFAULTS = {
+    'work_hours_per_week': (float, 40),
+    'sleep_hours_per_day': (float, 7),
+    'meetings_per_week': (int, 15),
+    'emails_per_day': (int, 75),
+    'deadline_pressure': (int, 5),
+    'task_complexity': (int, 5),
+    'team_support': (int, 5),
+    'work_life_balance': (int, 5)
+}
+
 # Initialize all engines
 stress_predictor = StressLevelPredictor()
 burnout_engine = BurnoutEngine()
@@ -19,7 +50,8 @@ llm_explainer = LLMExplainer()
 
 # Train model if not exists
 try:
-    stress_predictor.load_model()
+    if not stress_predictor.load_model():
+        raise FileNotFoundError(stress_predictor.model_path)
     print("✓ Model loaded successfully")
 except:
     print("Training new model...")
@@ -33,6 +65,220 @@ def index():
     return render_template('dashboard.html')
 
 
+def json_response(payload):
+    """
+    Serialize a response payload with orjson
+
+    Much faster than jsonify for the nested, float-heavy analysis results,
+    and serializes NumPy scalars/arrays from the engines natively.
+    OPT_NON_STR_KEYS accepts NumPy string keys (e.g. stress class labels).
+    """
+    return app.response_class(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+        mimetype='application/json'
+    )
+
+
+def parse_stress_features(data):
+    """
+    Extract the stress predictor features from a request payload
+
+    The returned dict is ordered like FEATURE_NAMES, so its values can be
+    fed to the model as a row without a per-key lookup.
+    """
+    features = {}
+    for name in FEATURE_NAMES:
+        cast, default = FEATURE_DEFAULTS[name]
+        value = cast(data.get(name, default))
+        # float() accepts "nan" and "inf", which the model cannot score
+        if not math.isfinite(value):
+            raise ValueError(f"{name} must be a finite number")
+        features[name] = value
+    return features
+
+
+def feature_row(stress_features):
+    """Pack parsed features into the (1, n_features) row used by the model"""
+    return np.fromiter(
+        stress_features.values(), dtype=np.float32, count=len(FEATURE_NAMES)
+    ).reshape(1, -1)
+
+
+def score_employee(stress_features, stress_result):
+    """
+    Run the burnout and phishing engines on top of a stress prediction
+
+    Returns:
+        dict with the combined results expected by LLMExplainer
+    """
+    # Calculate burnout score
+    burnout_data = {**stress_features, 'stress_level': stress_result['stress_level']}
+    burnout_result = burnout_engine.calculate_burnout_score(burnout_data)
+    
+    # Calculate phishing vulnerability
+    phishing_result = phishing_engine.calculate_vulnerability_index(
+        stress_features,
+        stress_result,
+        burnout_result
+    )
+    
+    return {
+        'stress': stress_result,
+        'burnout': burnout_result,
+        'phishing': phishing_result,
+        'inputs': stress_features
+    }
+
+
+def score_employees(features_list, stress_results):
+    """
+    Batched score_employee for a list of employees
+
+    Burnout and phishing scores are each computed in one vectorized pass
+    over all employees.
+
+    Returns:
+        list of combined results, in input order
+    """
+    features_df = pd.DataFrame(features_list)
+    stress_levels = [r['stress_level'] for r in stress_results]
+    
+    burnout_df = features_df.assign(stress_level=stress_levels)
+    burnout_batch = burnout_engine.calculate_burnout_score_batch(burnout_df)
+    
+    phishing_rows = phishing_engine.calculate_vulnerability_index_batch(
+        features_df,
+        stress_levels,
+        burnout_batch['total_score'].to_numpy()
+    ).to_dict('records')
+    burnout_rows = burnout_batch.to_dict('records')
+    
+    combined = []
+    for stress_features, stress_result, burnout_row, phishing_row in zip(
+        features_list, stress_results, burnout_rows, phishing_rows
+    ):
+        burnout_result = {
+            'total_score': burnout_row['total_score'],
+            'level': burnout_row['level'],
+            'color': burnout_row['color'],
+            'components': {name: burnout_row[name] for name in burnout_engine.weights},
+            'weights': burnout_engine.weights
+        }
+        
+        phishing_result = {
+            'vulnerability_index': phishing_row['vulnerability_index'],
+            'risk_level': phishing_row['risk_level'],
+            'color': phishing_row['color'],
+            'attack_success_probability': phishing_row['attack_success_probability'],
+            'recommendation': phishing_row['recommendation'],
+            'risk_factors': {name: phishing_row[name] for name in PHISHING_RISK_FACTORS},
+            'factor_weights': phishing_engine.risk_factors
+        }
+        
+        combined.append({
+            'stress': stress_result,
+            'burnout': burnout_result,
+            'phishing': phishing_result,
+            'inputs': stress_features
+        })
+    
+    return combined
+
+
+def format_result(employee_name, combined_results, explanation):
+    """Build the per-employee response payload"""
+    return {
+        'success': True,
+        'employee_name': employee_name,
+        'stress': combined_results['stress'],
+        'burnout': combined_results['burnout'],
+        'phishing': combined_results['phishing'],
+        'explanation': explanation,
+        'inputs': combined_results['inputs']
+    }
+
+
+def run_analysis(employee_name, stress_features):
+    """
+    Run employee data through all engines
+
+    Args:
+        employee_name: Name of the employee
+        stress_features: dict with the stress predictor features
+
+    Returns:
+        (result, cacheable): dict with the combined results of every engine,
+        and False if the explanation is a template standing in for a failed
+        OpenAI request
+    """
+    stress_result = stress_predictor.predict_vec(feature_row(stress_features))
+    combined_results = score_employee(stress_features, stress_result)
+    explanation = llm_explainer.generate_explanation(employee_name, combined_results, fallback=False)
+    cacheable = explanation is not None
+    if not cacheable:
+        explanation = llm_explainer.generate_explanation_template(employee_name, combined_results)
+    
+    return format_result(employee_name, combined_results, explanation), cacheable
+
+
+def warm_up_engines():
+    """
+    Run one dummy employee through the engines at startup
+
+    Moves one-time costs (scikit-learn/joblib thread pools, first-call
+    validation paths, lazy imports) out of the first real request. The LLM
+    is skipped so startup never spends API tokens.
+    """
+    stress_features = parse_stress_features({})
+    stress_result = stress_predictor.predict_vec(feature_row(stress_features))
+    score_employee(stress_features, stress_result)
+    
+    # Batch endpoint path
+    stress_results = stress_predictor.predict_batch([stress_features])
+    score_employees([stress_features], stress_results)
+    
+    # Large batches run the forest on all cores (a separately compiled kernel)
+    stress_predictor.predict_batch([stress_features] * PARALLEL_PREDICT_MIN_ROWS)
+
+
+warm_up_engines()
+
+
+# Analysis cache: (employee name, feature tuple) -> (expiry time, result),
+# least recently used first
+_analysis_cache = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+
+def run_analysis_cached(employee_name, feature_items):
+    """
+    Cached run_analysis keyed by the employee name and feature tuple
+
+    The engines are deterministic for a given input, so repeated requests
+    within ANALYSIS_CACHE_TTL seconds reuse the previous result and skip the
+    model, the engines and (most importantly) the LLM call. Template
+    fallbacks for failed OpenAI requests are not cached, so an outage does
+    not outlive itself.
+    """
+    key = (employee_name, feature_items)
+    with _analysis_cache_lock:
+        entry = _analysis_cache.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                _analysis_cache.move_to_end(key)
+                return entry[1]
+            del _analysis_cache[key]
+    
+    response, cacheable = run_analysis(employee_name, dict(feature_items))
+    if cacheable:
+        with _analysis_cache_lock:
+            _analysis_cache[key] = (time.monotonic() + ANALYSIS_CACHE_TTL, response)
+            _analysis_cache.move_to_end(key)
+            if len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+                _analysis_cache.popitem(last=False)
+    return response
+
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze():
     """
@@ -42,57 +288,90 @@ def analyze():
     try:
         data = request.json
         
-        # Extract employee info
-        employee_name = data.get('employee_name', 'Employee')
+        # Extract employee info (as a string: it is part of the cache key,
+        # which must be hashable)
+        employee_name = str(data.get('employee_name', 'Employee'))
         
         # Prepare features for stress prediction
-        stress_features = {
-            'work_hours_per_week': float(data.get('work_hours_per_week', 40)),
-            'sleep_hours_per_day': float(data.get('sleep_hours_per_day', 7)),
-            'meetings_per_week': int(data.get('meetings_per_week', 15)),
-            'emails_per_day': int(data.get('emails_per_day', 75)),
-            'deadline_pressure': int(data.get('deadline_pressure', 5)),
-            'task_complexity': int(data.get('task_complexity', 5)),
-            'team_support': int(data.get('team_support', 5)),
-            'work_life_balance': int(data.get('work_life_balance', 5))
-        }
+        stress_features = parse_stress_features(data)
         
-        # 1. Predict stress level
-        stress_result = stress_predictor.predict(stress_features)
+        # Features are always built in the same order, so the items tuple
+        # is a canonical cache key
+        response = run_analysis_cached(employee_name, tuple(stress_features.items()))
         
-        # 2. Calculate burnout score
-        burnout_data = {**stress_features, 'stress_level': stress_result['stress_level']}
-        burnout_result = burnout_engine.calculate_burnout_score(burnout_data)
+        return json_response(response)
         
-        # 3. Calculate phishing vulnerability
-        phishing_result = phishing_engine.calculate_vulnerability_index(
-            stress_features,
-            stress_result,
-            burnout_result
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+
+@app.route('/api/analyze_stream', methods=['POST'])
+def analyze_stream():
+    """
+    Streaming explanation endpoint
+    Takes the same payload as /api/analyze and responds with the executive
+    explanation as plain text, streamed while the LLM writes it
+    """
+    try:
+        data = request.json
+        employee_name = data.get('employee_name', 'Employee')
+        stress_features = parse_stress_features(data)
+        
+        stress_result = stress_predictor.predict_vec(feature_row(stress_features))
+        combined_results = score_employee(stress_features, stress_result)
+        
+        return app.response_class(
+            llm_explainer.stream_explanation(employee_name, combined_results),
+            mimetype='text/plain'
         )
         
-        # 4. Generate executive explanation
-        combined_results = {
-            'stress': stress_result,
-            'burnout': burnout_result,
-            'phishing': phishing_result,
-            'inputs': stress_features
-        }
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+
+@app.route('/api/analyze_batch', methods=['POST'])
+def analyze_batch():
+    """
+    Batch analysis endpoint
+    Expects {"employees": [{...}, ...]} and runs the stress model once
+    for the whole list. Results are returned in input order.
+    """
+    try:
+        employees = request.json.get('employees', [])
+        if not employees:
+            return jsonify({'success': True, 'results': []})
         
-        explanation = llm_explainer.generate_explanation(employee_name, combined_results)
+        employee_names = [e.get('employee_name', 'Employee') for e in employees]
+        features_list = [parse_stress_features(e) for e in employees]
         
-        # Prepare response
-        response = {
-            'success': True,
-            'employee_name': employee_name,
-            'stress': stress_result,
-            'burnout': burnout_result,
-            'phishing': phishing_result,
-            'explanation': explanation,
-            'inputs': stress_features
-        }
+        # 1. Predict all stress levels in a single model call
+        stress_results = stress_predictor.predict_batch(features_list)
+        
+        # 2. Run the burnout and phishing engines
+        combined_list = score_employees(features_list, stress_results)
+        
+        # 3. Generate executive explanations concurrently
+        explanations = llm_explainer.generate_explanations(
+            list(zip(employee_names, combined_list))
+        )
+        
+        results = [
+            format_result(employee_name, combined_results, explanation)
+            for employee_name, combined_results, explanation in zip(
+                employee_names, combined_list, explanations
+            )
+        ]
         
-        return jsonify(response)
+        return json_response({
+            'success': True,
+            'results': results
+        })
         
     except Exception as e:
         return jsonify({
@@ -106,10 +385,11 @@ def health():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'model_loaded': stress_predictor.model is not None,
+        'model_loaded': stress_predictor.forest is not None,
         'engines_ready': True
     })
 
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Threaded so concurrent requests overlap their LLM calls
+    app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
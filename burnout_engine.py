@@ -3,6 +3,26 @@ Module 2: Mathematical Engine for Burnout Score Calculation
 Calculates comprehensive burnout score based on multiple factors
 """
 import numpy as np
+import pandas as pd
+
+
+# Stress level (from StressLevelPredictor) mapped to a 0-100 score
+_STRESS_MAP = {'Low': 25, 'Medium': 50, 'High': 75, 'Critical': 100}
+
+
+def _clamp_score(score):
+    """Clamp a scalar score to the 0-100 range"""
+    return 0 if score < 0 else (100 if score > 100 else score)
+
+
+def _round_scores(scores):
+    """
+    Round an array of scores to 2 decimals like the scalar path does
+    
+    np.round scales by 100 and rounds, which resolves near-halves
+    differently from Python's round, so each value goes through round.
+    """
+    return [round(score, 2) for score in scores.tolist()]
 
 
 class BurnoutEngine:
@@ -14,6 +34,9 @@ class BurnoutEngine:
             'personal_accomplishment': 0.20,
             'work_overload': 0.20
         }
+        
+        # Weights in component order, precomputed for the weighted sum
+        self._weight_values = tuple(self.weights.values())
     
     def calculate_emotional_exhaustion(self, work_hours, sleep_hours, stress_level_score):
         """
@@ -28,16 +51,15 @@ class BurnoutEngine:
             score 0-100 (higher = more exhaustion)
         """
         # Normalize work hours (40 is baseline, 60+ is critical)
-        work_factor = min(100, max(0, (work_hours - 40) * 5))
+        work_factor = _clamp_score((work_hours - 40) * 5)
         
         # Sleep deprivation (7-8 hours is ideal)
-        sleep_factor = max(0, (7.5 - sleep_hours) * 15)
-        sleep_factor = min(100, sleep_factor)
+        sleep_factor = _clamp_score((7.5 - sleep_hours) * 15)
         
         # Combine factors
         score = (work_factor * 0.4 + sleep_factor * 0.3 + stress_level_score * 0.3)
         
-        return min(100, max(0, score))
+        return _clamp_score(score)
     
     def calculate_depersonalization(self, team_support, work_life_balance, meetings_per_week):
         """
@@ -58,12 +80,11 @@ class BurnoutEngine:
         balance_factor = (10 - work_life_balance) * 10
         
         # Too many meetings can lead to meeting fatigue
-        meeting_factor = min(100, (meetings_per_week - 10) * 3)
-        meeting_factor = max(0, meeting_factor)
+        meeting_factor = _clamp_score((meetings_per_week - 10) * 3)
         
         score = (support_factor * 0.4 + balance_factor * 0.4 + meeting_factor * 0.2)
         
-        return min(100, max(0, score))
+        return _clamp_score(score)
     
     def calculate_personal_accomplishment(self, task_complexity, deadline_pressure):
         """
@@ -85,7 +106,7 @@ class BurnoutEngine:
         
         score = complexity_factor * 0.3 + pressure_factor * 0.4 + synergy * 0.3
         
-        return min(100, max(0, score))
+        return _clamp_score(score)
     
     def calculate_work_overload(self, work_hours, emails_per_day, meetings_per_week):
         """
@@ -100,13 +121,13 @@ class BurnoutEngine:
             score 0-100 (higher = more overload)
         """
         # Normalize to 0-100 scale
-        hours_factor = min(100, max(0, (work_hours - 40) * 3))
+        hours_factor = _clamp_score((work_hours - 40) * 3)
         email_factor = min(100, (emails_per_day - 50) * 0.5)
         meeting_factor = min(100, (meetings_per_week - 10) * 4)
         
         score = (hours_factor * 0.5 + email_factor * 0.25 + meeting_factor * 0.25)
         
-        return min(100, max(0, score))
+        return _clamp_score(score)
     
     def calculate_burnout_score(self, employee_data):
         """
@@ -119,8 +140,7 @@ class BurnoutEngine:
             dict with burnout score and breakdown
         """
         # Map stress level to score
-        stress_map = {'Low': 25, 'Medium': 50, 'High': 75, 'Critical': 100}
-        stress_score = stress_map.get(employee_data.get('stress_level', 'Medium'), 50)
+        stress_score = _STRESS_MAP.get(employee_data.get('stress_level', 'Medium'), 50)
         
         # Calculate components
         emotional_exhaustion = self.calculate_emotional_exhaustion(
@@ -147,11 +167,12 @@ class BurnoutEngine:
         )
         
         # Calculate weighted total
+        w_exhaustion, w_depersonalization, w_accomplishment, w_overload = self._weight_values
         total_score = (
-            emotional_exhaustion * self.weights['emotional_exhaustion'] +
-            depersonalization * self.weights['depersonalization'] +
-            personal_accomplishment * self.weights['personal_accomplishment'] +
-            work_overload * self.weights['work_overload']
+            emotional_exhaustion * w_exhaustion +
+            depersonalization * w_depersonalization +
+            personal_accomplishment * w_accomplishment +
+            work_overload * w_overload
         )
         
         # Categorize burnout level
@@ -180,6 +201,115 @@ class BurnoutEngine:
             },
             'weights': self.weights
         }
+    
+    def _emotional_exhaustion_vec(self, work_hours, sleep_hours, stress_level_score):
+        """Vectorized calculate_emotional_exhaustion over NumPy arrays"""
+        work_factor = (work_hours - 40) * 5
+        np.clip(work_factor, 0, 100, out=work_factor)
+        sleep_factor = (7.5 - sleep_hours) * 15
+        np.clip(sleep_factor, 0, 100, out=sleep_factor)
+        
+        score = work_factor * 0.4 + sleep_factor * 0.3 + stress_level_score * 0.3
+        
+        return np.clip(score, 0, 100, out=score)
+    
+    def _depersonalization_vec(self, team_support, work_life_balance, meetings_per_week):
+        """Vectorized calculate_depersonalization over NumPy arrays"""
+        support_factor = (10 - team_support) * 10
+        balance_factor = (10 - work_life_balance) * 10
+        meeting_factor = (meetings_per_week - 10) * 3
+        np.clip(meeting_factor, 0, 100, out=meeting_factor)
+        
+        score = support_factor * 0.4 + balance_factor * 0.4 + meeting_factor * 0.2
+        
+        return np.clip(score, 0, 100, out=score)
+    
+    def _personal_accomplishment_vec(self, task_complexity, deadline_pressure):
+        """Vectorized calculate_personal_accomplishment over NumPy arrays"""
+        complexity_factor = task_complexity * 5
+        pressure_factor = deadline_pressure * 5
+        synergy = (task_complexity * deadline_pressure) * 0.5
+        
+        score = complexity_factor * 0.3 + pressure_factor * 0.4 + synergy * 0.3
+        
+        return np.clip(score, 0, 100, out=score)
+    
+    def _work_overload_vec(self, work_hours, emails_per_day, meetings_per_week):
+        """Vectorized calculate_work_overload over NumPy arrays"""
+        hours_factor = (work_hours - 40) * 3
+        np.clip(hours_factor, 0, 100, out=hours_factor)
+        email_factor = (emails_per_day - 50) * 0.5
+        np.minimum(email_factor, 100, out=email_factor)
+        meeting_factor = (meetings_per_week - 10) * 4
+        np.minimum(meeting_factor, 100, out=meeting_factor)
+        
+        score = hours_factor * 0.5 + email_factor * 0.25 + meeting_factor * 0.25
+        
+        return np.clip(score, 0, 100, out=score)
+    
+    def calculate_burnout_score_batch(self, df):
+        """
+        Calculate burnout scores for many employees at once
+        
+        Args:
+            df: DataFrame with one row per employee, containing the metric
+                columns used by calculate_burnout_score and 'stress_level'
+        
+        Returns:
+            DataFrame (same index) with total_score, level, color and one
+            column per burnout component
+        """
+        stress_score = df['stress_level'].map(_STRESS_MAP).fillna(50).to_numpy(dtype=np.float64)
+        
+        work_hours = df['work_hours_per_week'].to_numpy(dtype=np.float64)
+        meetings = df['meetings_per_week'].to_numpy(dtype=np.float64)
+        
+        components = {
+            'emotional_exhaustion': self._emotional_exhaustion_vec(
+                work_hours,
+                df['sleep_hours_per_day'].to_numpy(dtype=np.float64),
+                stress_score
+            ),
+            'depersonalization': self._depersonalization_vec(
+                df['team_support'].to_numpy(dtype=np.float64),
+                df['work_life_balance'].to_numpy(dtype=np.float64),
+                meetings
+            ),
+            'personal_accomplishment': self._personal_accomplishment_vec(
+                df['task_complexity'].to_numpy(dtype=np.float64),
+                df['deadline_pressure'].to_numpy(dtype=np.float64)
+            ),
+            'work_overload': self._work_overload_vec(
+                work_hours,
+                df['emails_per_day'].to_numpy(dtype=np.float64),
+                meetings
+            )
+        }
+        
+        # Calculate weighted total, summed in the same order as the scalar
+        # version (a matmul reorders the additions and can flip a level)
+        w_exhaustion, w_depersonalization, w_accomplishment, w_overload = self._weight_values
+        total_score = (
+            components['emotional_exhaustion'] * w_exhaustion +
+            components['depersonalization'] * w_depersonalization +
+            components['personal_accomplishment'] * w_accomplishment +
+            components['work_overload'] * w_overload
+        )
+        
+        # Categorize burnout level (same thresholds as the scalar version)
+        conditions = [total_score < 30, total_score < 50, total_score < 70]
+        level = np.select(conditions, ['Low Risk', 'Moderate Risk', 'High Risk'], 'Critical Risk')
+        color = np.select(conditions, ['green', 'yellow', 'orange'], 'red')
+        
+        result = pd.DataFrame({
+            'total_score': _round_scores(total_score),
+            'level': level,
+            'color': color
+        }, index=df.index)
+        for name, values in components.items():
+            result[name] = _round_scores(values)
+        
+        return result
 
 
 if __name__ == '__main__':
@@ -2,8 +2,123 @@
 Module 4: LLM Module for Executive Explanations
 Generates personalized executive summaries using AI
 """
+import asyncio
+from bisect import bisect_right
+import hashlib
+import importlib.util
+import json
 import os
-from typing import Dict, Any
+import random
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+
+# Chat model used for all OpenAI explanations
+OPENAI_MODEL = "gpt-3.5-turbo"
+
+# Output token cap of a structured (JSON sections) explanation, and of a
+# streamed prose one
+STRUCTURED_MAX_TOKENS = 280
+PROSE_MAX_TOKENS = 500
+
+# Maximum number of OpenAI explanations kept in the local response cache
+EXPLANATION_CACHE_SIZE = 1024
+
+# Reuse of OpenAI explanations across employees: an employee whose prompt
+# shows exactly the same figures as a cached profile (only the name differs)
+# gets that profile's explanation, renamed. Explanations quote the figures,
+# so nearby but different values are never reused. At most
+# SEMANTIC_CACHE_SIZE profiles are kept.
+SEMANTIC_CACHE_SIZE = 1024
+
+# Employees packed into one bulk request (bounded by the model's output limit),
+# and the output tokens budgeted per employee: a structured explanation plus
+# its id and JSON framing
+BULK_CHUNK_SIZE = 8
+BULK_MAX_TOKENS_PER_EMPLOYEE = STRUCTURED_MAX_TOKENS + 40
+
+# Concurrent OpenAI requests allowed per batch, and extra attempts on rate limits
+MAX_CONCURRENT_REQUESTS = 20
+RATE_LIMIT_RETRIES = 4
+
+# Connection pool limits of the shared OpenAI clients
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+
+# OpenAI clients shared by every LLMExplainer, keyed by API key, so
+# instances reuse one connection pool (and its open TLS connections)
+_clients = {}
+_clients_lock = threading.Lock()
+
+# Static text of the template explanation, built once at import
+_SECURITY_LOW = "This relatively low vulnerability indicates good security awareness, though continuous monitoring is recommended."
+_SECURITY_MODERATE = "This moderate vulnerability suggests scheduling a security awareness refresher while addressing workload concerns."
+_SECURITY_ELEVATED = "This elevated vulnerability requires urgent security awareness training and workload management."
+
+_REC_HEADER = "**Recommended Actions:**"
+_RECS_CRITICAL_BURNOUT = (
+    "• **Immediate workload review** and potential redistribution",
+    "• Schedule **wellness consultation** within 48 hours"
+)
+_RECS_HIGH_BURNOUT = (
+    "• **Schedule a check-in** to discuss workload and support needs",
+    "• Consider **flexible work arrangements** if feasible"
+)
+_REC_SLEEP = "• Encourage **better sleep hygiene** and time management"
+_REC_MEETINGS = "• **Audit meeting necessity** and reduce where possible"
+_RECS_SECURITY = (
+    "• Provide **targeted security awareness training**",
+    "• Implement **email filtering** and additional safeguards"
+)
+_RECS_DEFAULT = (
+    "• Continue **monitoring** these metrics monthly",
+    "• Maintain current **support structures**"
+)
+
+# Severity tiers of the template explanation (0 = healthy, 1 = elevated,
+# 2 = critical): bisect_right on the thresholds gives the tier of a score
+_BURNOUT_THRESHOLDS = (50, 70)
+_VULNERABILITY_THRESHOLDS = (50, 70)
+_STRESS_TIERS = {'High': 1, 'Critical': 2}
+
+# Per tier: opening wording around the stress and burnout fragments, security
+# closing and burnout recommendations
+_OPENING_PARTS = (
+    (" currently maintains ", " with ", ", showing relatively healthy work patterns."),
+    (" shows ", " and ", ", indicating elevated risk that should be addressed proactively."),
+    (" is currently experiencing ", " with ", ". This situation requires immediate attention.")
+)
+_SECURITY_CLOSINGS = (_SECURITY_LOW, _SECURITY_MODERATE, _SECURITY_ELEVATED)
+_BURNOUT_RECS = ((), _RECS_HIGH_BURNOUT, _RECS_CRITICAL_BURNOUT)
+
+
+def _assemble_explanation(opening: str, factors: str, security: str, recommendations: List[str]) -> str:
+    """Lay out explanation sections as the Markdown shown on the dashboard"""
+    return "".join([
+        opening, " ", factors, "\n\n",
+        security, "\n\n",
+        _REC_HEADER, "\n", "\n".join(recommendations)
+    ])
+
+
+def _get_client(api_key: str):
+    """Return the shared OpenAI client for an API key, creating it on first use"""
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            import httpx
+            from openai import OpenAI, DefaultHttpxClient
+            client = OpenAI(
+                api_key=api_key,
+                http_client=DefaultHttpxClient(limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+                ))
+            )
+            _clients[api_key] = client
+        return client
 
 
 class LLMExplainer:
@@ -17,55 +132,353 @@ class LLMExplainer:
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         self.use_openai = self.api_key is not None
         
-        if self.use_openai:
-            try:
-                from openai import OpenAI
-                self.client = OpenAI(api_key=self.api_key)
-            except ImportError:
-                print("OpenAI package not available, using template-based explanations")
-                self.use_openai = False
-    
-    def generate_explanation_openai(self, employee_name: str, results: Dict[str, Any]) -> str:
-        """Generate explanation using OpenAI API"""
-        prompt = f"""As an executive HR consultant, provide a professional summary for {employee_name}.
-
-Analysis Results:
-- Stress Level: {results['stress']['stress_level']} (Confidence: {results['stress']['confidence']:.1%})
-- Burnout Score: {results['burnout']['total_score']}/100 ({results['burnout']['level']})
-- Phishing Vulnerability: {results['phishing']['vulnerability_index']}/100 ({results['phishing']['risk_level']})
-- Attack Success Probability: {results['phishing']['attack_success_probability']}%
-
-Component Breakdown:
-- Emotional Exhaustion: {results['burnout']['components']['emotional_exhaustion']}/100
-- Depersonalization: {results['burnout']['components']['depersonalization']}/100
-- Work Overload: {results['burnout']['components']['work_overload']}/100
-
-Key Metrics:
-- Work Hours/Week: {results['inputs']['work_hours_per_week']}
-- Sleep Hours/Day: {results['inputs']['sleep_hours_per_day']}
-- Meetings/Week: {results['inputs']['meetings_per_week']}
-- Emails/Day: {results['inputs']['emails_per_day']}
-
-Provide a 2-3 paragraph executive summary that:
-1. Summarizes the employee's current state
-2. Identifies key risk factors
-3. Provides actionable recommendations
-Be professional, empathetic, and data-driven."""
-
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert HR consultant specializing in employee wellbeing and security risk assessment."},
-                    {"role": "user", "content": prompt}
+        # LRU cache of OpenAI explanations, keyed by a hash of the request
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Semantic cache: name-free request hash -> (name pattern, explanation),
+        # least recently used first
+        self._semantic_cache = OrderedDict()
+        self.semantic_hits = 0
+        
+        # Only check that openai is installed; importing it (and building the
+        # client) is deferred to the first API call
+        self._client = None
+        if self.use_openai and importlib.util.find_spec('openai') is None:
+            print("OpenAI package not available, using template-based explanations")
+            self.use_openai = False
+    
+    @property
+    def client(self):
+        """OpenAI client, shared with other instances using the same key"""
+        if self._client is None:
+            self._client = _get_client(self.api_key)
+        return self._client
+    
+    @client.setter
+    def client(self, client):
+        self._client = client
+    
+    # Prompt layout contract: everything that is identical for every
+    # employee lives in SYSTEM_PROMPT and is sent first, byte-for-byte, so the
+    # provider's prompt-prefix cache can reuse it. Per-employee values only
+    # appear in the user message that follows. Keep it static first, dynamic last.
+    SYSTEM_PROMPT = (
+        "You are an expert HR consultant in employee wellbeing and security risk.\n"
+        "Write a 2-3 paragraph executive summary of the employee in the user message: "
+        "current state, key risk factors and actionable recommendations. "
+        "Be professional, empathetic and data-driven."
+    )
+    
+    # Appended to SYSTEM_PROMPT for single-employee requests: the answer comes
+    # back as short JSON sections, laid out like the template explanation
+    STRUCTURED_INSTRUCTIONS = (
+        "\n\n"
+        "Return a JSON object with the keys "
+        '"opening" (current state, 1-2 sentences), '
+        '"factors" (key risk factors, 1-2 sentences), '
+        '"security" (phishing risk, 1-2 sentences) and '
+        '"recommendations" (list of 2-4 short actions). '
+        "Use Markdown bold for key figures."
+    )
+    
+    # Appended to SYSTEM_PROMPT for bulk requests, keeping the shared prefix;
+    # each summary has the sections of STRUCTURED_INSTRUCTIONS
+    BULK_INSTRUCTIONS = (
+        "\n\n"
+        "The user message is a JSON array of employees, each with an id and its analysis. "
+        "Write one summary per employee and return a JSON object of the form "
+        '{"summaries": [{"id": <id>, "opening": ..., "factors": ..., "security": ..., "recommendations": [...]}, ...]} '
+        "with one entry per input employee: "
+        '"opening" (current state, 1-2 sentences), '
+        '"factors" (key risk factors, 1-2 sentences), '
+        '"security" (phishing risk, 1-2 sentences) and '
+        '"recommendations" (list of 2-4 short actions). '
+        "Use Markdown bold for key figures."
+    )
+    
+    @staticmethod
+    def _user_prompt(employee_name: str, results: Dict[str, Any]) -> str:
+        """
+        Render the per-employee part of the prompt
+        
+        Kept to the fields a summary actually draws on, with compact labels:
+        input tokens are billed on every request.
+        """
+        stress = results['stress']
+        burnout = results['burnout']
+        components = burnout['components']
+        phishing = results['phishing']
+        inputs = results['inputs']
+        return (
+            f"Employee: {employee_name}\n"
+            f"Stress: {stress['stress_level']} ({stress['confidence']:.0%} confidence)\n"
+            f"Burnout: {burnout['total_score']}/100 ({burnout['level']}); "
+            f"exhaustion {components['emotional_exhaustion']}, "
+            f"depersonalization {components['depersonalization']}, "
+            f"overload {components['work_overload']}\n"
+            f"Phishing: {phishing['vulnerability_index']}/100 ({phishing['risk_level']}), "
+            f"{phishing['attack_success_probability']}% attack success\n"
+            f"Work: {inputs['work_hours_per_week']} h/week, {inputs['sleep_hours_per_day']} h sleep/day, "
+            f"{inputs['meetings_per_week']} meetings/week, {inputs['emails_per_day']} emails/day"
+        )
+    
+    def _chat_params(self, employee_name: str, results: Dict[str, Any], structured: bool = True) -> Dict[str, Any]:
+        """
+        Build the chat completion request for one employee
+        
+        Structured requests ask for JSON sections (see _format_structured),
+        which keeps answers short; prose requests are used for streaming.
+        """
+        if structured:
+            return {
+                'model': OPENAI_MODEL,
+                'messages': [
+                    {"role": "system", "content": self.SYSTEM_PROMPT + self.STRUCTURED_INSTRUCTIONS},
+                    {"role": "user", "content": self._user_prompt(employee_name, results)}
                 ],
-                temperature=0.7,
-                max_tokens=500
-            )
-            return response.choices[0].message.content
-        except Exception as e:
+                'temperature': 0.7,
+                'max_tokens': STRUCTURED_MAX_TOKENS,
+                'response_format': {"type": "json_object"}
+            }
+        return {
+            'model': OPENAI_MODEL,
+            'messages': [
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": self._user_prompt(employee_name, results)}
+            ],
+            'temperature': 0.7,
+            'max_tokens': PROSE_MAX_TOKENS
+        }
+    
+    @staticmethod
+    def _format_structured(content: str) -> str:
+        """
+        Assemble a structured answer into the explanation Markdown
+        
+        Raises:
+            ValueError, KeyError or TypeError if the answer is malformed
+            (e.g. cut off by the token cap)
+        """
+        return LLMExplainer._assemble_sections(json.loads(content))
+    
+    @staticmethod
+    def _assemble_sections(sections: Dict[str, Any]) -> str:
+        """
+        Assemble decoded answer sections into the explanation Markdown
+        
+        Raises:
+            KeyError or TypeError if a section is missing or malformed
+        """
+        recommendations = sections['recommendations']
+        if not isinstance(recommendations, list):
+            raise TypeError("recommendations must be a list")
+        return _assemble_explanation(
+            sections['opening'],
+            sections['factors'],
+            sections['security'],
+            [f"• {action}" for action in recommendations]
+        )
+    
+    @staticmethod
+    def _cache_key(params: Dict[str, Any]) -> str:
+        """
+        Hash a chat request into a cache key
+        
+        The request holds the rendered prompt, including the employee name
+        and the raw input metrics, so only an exact repeat of a request
+        shares its key (the answer quotes the name). Model and sampling
+        settings are part of the key too. Reuse across employees is left
+        to the semantic cache.
+        """
+        payload = json.dumps(params, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Look up a cached explanation and record the hit or miss"""
+        with self._cache_lock:
+            explanation = self._cache.get(key)
+            if explanation is None:
+                self.cache_misses += 1
+            else:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+            return explanation
+    
+    def _cache_put(self, key: str, explanation: str):
+        """Store an explanation, evicting the least recently used one"""
+        with self._cache_lock:
+            self._cache[key] = explanation
+            self._cache.move_to_end(key)
+            if len(self._cache) > EXPLANATION_CACHE_SIZE:
+                self._cache.popitem(last=False)
+    
+    def _profile_key(self, params: Dict[str, Any], results: Dict[str, Any]) -> str:
+        """
+        Semantic cache key: the request's cache key with the employee name
+        left out of the prompt
+        
+        Everything else the model sees (figures, levels, instructions, model
+        and sampling settings) must match for two requests to share it.
+        """
+        messages = [params['messages'][0], {"role": "user", "content": self._user_prompt("", results)}]
+        return self._cache_key({**params, 'messages': messages})
+    
+    def _semantic_get(self, params: Dict[str, Any], employee_name: str, results: Dict[str, Any]) -> Optional[str]:
+        """
+        Reuse the explanation of a profile with identical figures, renamed
+        
+        Only whole-word occurrences of the cached name are replaced, so a
+        short name is not substituted inside other words.
+        """
+        if not employee_name:
+            # Nothing to put in place of the cached name
+            return None
+        key = self._profile_key(params, results)
+        
+        with self._cache_lock:
+            entry = self._semantic_cache.get(key)
+            if entry is None:
+                return None
+            self._semantic_cache.move_to_end(key)
+            self.semantic_hits += 1
+        name_pattern, explanation = entry
+        return name_pattern.sub(lambda match: employee_name, explanation)
+    
+    def _semantic_put(self, params: Dict[str, Any], employee_name: str, results: Dict[str, Any], explanation: str):
+        """Remember a profile's explanation, evicting the least recently used one"""
+        if not employee_name:
+            # The name is needed to personalize the explanation on reuse
+            return
+        # The name as a whole word: not preceded or followed by a letter or
+        # digit (\b would fail on names ending in punctuation)
+        name_pattern = re.compile(rf"(?<!\w){re.escape(employee_name)}(?!\w)")
+        if len(name_pattern.findall(explanation)) != explanation.count(employee_name):
+            # The name also occurs inside other words; renaming would garble them
+            return
+        key = self._profile_key(params, results)
+        
+        with self._cache_lock:
+            self._semantic_cache[key] = (name_pattern, explanation)
+            self._semantic_cache.move_to_end(key)
+            if len(self._semantic_cache) > SEMANTIC_CACHE_SIZE:
+                self._semantic_cache.popitem(last=False)
+    
+    def _lookup(self, key: str, params: Dict[str, Any], employee_name: str, results: Dict[str, Any]) -> Optional[str]:
+        """Exact cache first, then the semantic cache"""
+        explanation = self._cache_get(key)
+        if explanation is None:
+            explanation = self._semantic_get(params, employee_name, results)
+        return explanation
+    
+    def _remember(self, key: str, params: Dict[str, Any], employee_name: str, results: Dict[str, Any], explanation: str):
+        """Store a fresh OpenAI explanation in both caches"""
+        self._cache_put(key, explanation)
+        self._semantic_put(params, employee_name, results, explanation)
+    
+    def generate_explanation_openai(self, employee_name: str, results: Dict[str, Any], fallback: bool = True) -> Optional[str]:
+        """
+        Generate explanation using OpenAI API
+        
+        API failures and malformed answers fall back to the template (or
+        return None if fallback is False); any other exception is a bug and
+        propagates.
+        """
+        from openai import APIError
+        
+        params = self._chat_params(employee_name, results)
+        key = self._cache_key(params)
+        cached = self._lookup(key, params, employee_name, results)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = self.client.chat.completions.create(**params)
+            explanation = self._format_structured(response.choices[0].message.content)
+        except (APIError, ValueError, KeyError, TypeError) as e:
             print(f"OpenAI API error: {e}")
+            if not fallback:
+                return None
             return self.generate_explanation_template(employee_name, results)
+        
+        self._remember(key, params, employee_name, results, explanation)
+        return explanation
+    
+    def stream_explanation(self, employee_name: str, results: Dict[str, Any]) -> Iterator[str]:
+        """
+        Generate executive explanation as a stream of text chunks
+        
+        With OpenAI the chunks are yielded as the model writes them, so a UI
+        can start rendering after the first tokens instead of waiting for the
+        whole summary. Cached and template explanations arrive as a single
+        chunk.
+        
+        Unlike generate_explanation the model answers in free prose, since
+        structured JSON cannot be shown until it is complete.
+        """
+        if not self.use_openai:
+            yield self.generate_explanation_template(employee_name, results)
+            return
+        
+        params = self._chat_params(employee_name, results, structured=False)
+        key = self._cache_key(params)
+        cached = self._lookup(key, params, employee_name, results)
+        if cached is not None:
+            yield cached
+            return
+        
+        from openai import APIError
+        
+        parts = []
+        try:
+            for chunk in self.client.chat.completions.create(**params, stream=True):
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield parts[-1]
+        except APIError as e:
+            print(f"OpenAI API error: {e}")
+            # Text already sent cannot be taken back; only fall back if none was
+            if not parts:
+                yield self.generate_explanation_template(employee_name, results)
+            return
+        
+        self._remember(key, params, employee_name, results, "".join(parts))
+    
+    async def _generate_explanation_openai_async(self, client, semaphore, employee_name: str, results: Dict[str, Any]) -> str:
+        """
+        Async generate_explanation_openai using a shared AsyncOpenAI client
+        
+        At most MAX_CONCURRENT_REQUESTS calls hold the semaphore at once.
+        Rate-limited calls back off exponentially (with jitter) and retry up
+        to RATE_LIMIT_RETRIES times before falling back to the template.
+        """
+        from openai import APIError, RateLimitError
+        
+        params = self._chat_params(employee_name, results)
+        key = self._cache_key(params)
+        cached = self._lookup(key, params, employee_name, results)
+        if cached is not None:
+            return cached
+        
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            try:
+                async with semaphore:
+                    response = await client.chat.completions.create(**params)
+                explanation = self._format_structured(response.choices[0].message.content)
+                break
+            except RateLimitError as e:
+                if attempt == RATE_LIMIT_RETRIES:
+                    print(f"OpenAI API error: {e}")
+                    return self.generate_explanation_template(employee_name, results)
+                await asyncio.sleep(2 ** attempt + random.random())
+            except (APIError, ValueError, KeyError, TypeError) as e:
+                print(f"OpenAI API error: {e}")
+                return self.generate_explanation_template(employee_name, results)
+        
+        self._remember(key, params, employee_name, results, explanation)
+        return explanation
     
     def generate_explanation_template(self, employee_name: str, results: Dict[str, Any]) -> str:
         """Generate explanation using templates (fallback)"""
@@ -75,13 +488,20 @@ Be professional, empathetic, and data-driven."""
         phishing_risk = results['phishing']['risk_level']
         vulnerability_index = results['phishing']['vulnerability_index']
         
-        # Opening based on risk level
-        if burnout_score >= 70 or stress_level == 'Critical':
-            opening = f"{employee_name} is currently experiencing **{stress_level.lower()} stress levels** with a burnout score of **{burnout_score}/100** ({burnout_level}). This situation requires immediate attention."
-        elif burnout_score >= 50 or stress_level == 'High':
-            opening = f"{employee_name} shows **{stress_level.lower()} stress levels** and a burnout score of **{burnout_score}/100** ({burnout_level}), indicating elevated risk that should be addressed proactively."
-        else:
-            opening = f"{employee_name} currently maintains **{stress_level.lower()} stress levels** with a burnout score of **{burnout_score}/100** ({burnout_level}), showing relatively healthy work patterns."
+        # Fragments shared by every opening, formatted once
+        stress_text = f"**{stress_level.lower()} stress levels**"
+        burnout_text = f"a burnout score of **{burnout_score}/100** ({burnout_level})"
+        
+        # Severity tiers, shared by the opening and the recommendations
+        burnout_tier = bisect_right(_BURNOUT_THRESHOLDS, burnout_score)
+        security_tier = bisect_right(_VULNERABILITY_THRESHOLDS, vulnerability_index)
+        
+        # Opening based on risk level (the worse of burnout and stress)
+        opening_tier = _STRESS_TIERS.get(stress_level, 0)
+        if burnout_tier > opening_tier:
+            opening_tier = burnout_tier
+        lead, joiner, tail = _OPENING_PARTS[opening_tier]
+        opening = f"{employee_name}{lead}{stress_text}{joiner}{burnout_text}{tail}"
         
         # Key factors analysis
         inputs = results['inputs']
@@ -107,63 +527,229 @@ Be professional, empathetic, and data-driven."""
         # Security risk assessment
         security_text = f"From a security perspective, the **Phishing Vulnerability Index** stands at **{vulnerability_index}/100** ({phishing_risk}), with an estimated **{results['phishing']['attack_success_probability']}% attack success probability**. "
         
-        if vulnerability_index >= 70:
-            security_text += "This elevated vulnerability requires urgent security awareness training and workload management."
-        elif vulnerability_index >= 50:
-            security_text += "This moderate vulnerability suggests scheduling a security awareness refresher while addressing workload concerns."
-        else:
-            security_text += "This relatively low vulnerability indicates good security awareness, though continuous monitoring is recommended."
-        
-        # Recommendations
-        recommendations = []
-        
-        if burnout_score >= 70:
-            recommendations.append("**Immediate workload review** and potential redistribution")
-            recommendations.append("Schedule **wellness consultation** within 48 hours")
-        elif burnout_score >= 50:
-            recommendations.append("**Schedule a check-in** to discuss workload and support needs")
-            recommendations.append("Consider **flexible work arrangements** if feasible")
+        # Recommendations (pre-bulleted static strings)
+        recommendations = list(_BURNOUT_RECS[burnout_tier])
         
         if inputs['sleep_hours_per_day'] < 6.5:
-            recommendations.append("Encourage **better sleep hygiene** and time management")
+            recommendations.append(_REC_SLEEP)
         
         if inputs['meetings_per_week'] > 20:
-            recommendations.append("**Audit meeting necessity** and reduce where possible")
+            recommendations.append(_REC_MEETINGS)
         
-        if vulnerability_index >= 50:
-            recommendations.append("Provide **targeted security awareness training**")
-            recommendations.append("Implement **email filtering** and additional safeguards")
+        if security_tier:
+            recommendations.extend(_RECS_SECURITY)
         
         if not recommendations:
-            recommendations.append("Continue **monitoring** these metrics monthly")
-            recommendations.append("Maintain current **support structures**")
-        
-        rec_text = "**Recommended Actions:**\n" + "\n".join(f"• {rec}" for rec in recommendations)
+            recommendations.extend(_RECS_DEFAULT)
         
         # Combine all parts
-        explanation = f"""{opening} {factor_text}
-
-{security_text}
-
-{rec_text}"""
-        
-        return explanation
+        return _assemble_explanation(opening, factor_text, security_text + _SECURITY_CLOSINGS[security_tier], recommendations)
     
-    def generate_explanation(self, employee_name: str, results: Dict[str, Any]) -> str:
+    def generate_explanation(self, employee_name: str, results: Dict[str, Any], fallback: bool = True) -> Optional[str]:
         """
         Generate executive explanation
         
         Args:
             employee_name: Name of the employee
             results: Combined results from all engines
+            fallback: use the template if the OpenAI request fails; if
+                False, None is returned instead
         
         Returns:
             Professional executive summary
         """
         if self.use_openai:
-            return self.generate_explanation_openai(employee_name, results)
+            return self.generate_explanation_openai(employee_name, results, fallback)
         else:
             return self.generate_explanation_template(employee_name, results)
+    
+    async def generate_explanations_async(self, employees: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Generate executive explanations for many employees concurrently
+        
+        Args:
+            employees: list of (employee_name, results) pairs
+        
+        Returns:
+            list of summaries, in input order
+        """
+        if not self.use_openai:
+            return [self.generate_explanation_template(name, results) for name, results in employees]
+        
+        # One client per batch: its connection pool is bound to this event loop.
+        # The SDK's own retries are off; rate limits are retried (with
+        # backoff) in _generate_explanation_openai_async only
+        from openai import AsyncOpenAI
+        client = AsyncOpenAI(api_key=self.api_key, max_retries=0)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        try:
+            return await asyncio.gather(*[
+                self._generate_explanation_openai_async(client, semaphore, name, results)
+                for name, results in employees
+            ])
+        finally:
+            await client.close()
+    
+    def generate_explanations(self, employees: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Synchronous wrapper around generate_explanations_async
+        
+        The OpenAI calls overlap, so a batch takes roughly as long as its
+        slowest request. Must not be called from a running event loop.
+        """
+        return asyncio.run(self.generate_explanations_async(employees))
+    
+    def _generate_bulk_chunk(self, employees: List[Tuple[str, Dict[str, Any]]]) -> List[Optional[str]]:
+        """
+        Summarize up to BULK_CHUNK_SIZE employees with a single OpenAI request
+        
+        Returns:
+            list of summaries in input order (laid out like single structured
+            answers), None where the answer lacked a well-formed one
+        """
+        from openai import APIError
+        
+        payload = [
+            {'id': i, 'analysis': self._user_prompt(name, results)}
+            for i, (name, results) in enumerate(employees)
+        ]
+        
+        summaries = {}
+        try:
+            response = self.client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": self.SYSTEM_PROMPT + self.BULK_INSTRUCTIONS},
+                    {"role": "user", "content": json.dumps(payload)}
+                ],
+                temperature=0.7,
+                max_tokens=BULK_MAX_TOKENS_PER_EMPLOYEE * len(employees),
+                response_format={"type": "json_object"}
+            )
+            items = json.loads(response.choices[0].message.content)['summaries']
+            if not isinstance(items, list):
+                raise TypeError("summaries must be a list")
+        except (APIError, ValueError, KeyError, TypeError) as e:
+            print(f"OpenAI bulk request failed, falling back to single requests: {e}")
+            items = []
+        
+        for item in items:
+            try:
+                summaries[int(item['id'])] = self._assemble_sections(item)
+            except (ValueError, KeyError, TypeError):
+                # Malformed entry: that employee gets a single request
+                pass
+        
+        return [summaries.get(i) for i in range(len(employees))]
+    
+    def generate_explanations_bulk(self, employees: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Generate executive explanations for many employees in few requests
+        
+        Packs BULK_CHUNK_SIZE employees into each OpenAI call so the
+        instructions are sent once per chunk instead of once per employee.
+        Cached explanations are reused and new ones are added to the cache.
+        
+        Args:
+            employees: list of (employee_name, results) pairs
+        
+        Returns:
+            list of summaries, in input order
+        """
+        if not self.use_openai:
+            return [self.generate_explanation_template(name, results) for name, results in employees]
+        
+        explanations = [None] * len(employees)
+        params = [self._chat_params(name, results) for name, results in employees]
+        keys = [self._cache_key(p) for p in params]
+        pending = []
+        for i, key in enumerate(keys):
+            explanations[i] = self._lookup(key, params[i], *employees[i])
+            if explanations[i] is None:
+                pending.append(i)
+        
+        for start in range(0, len(pending), BULK_CHUNK_SIZE):
+            chunk = pending[start:start + BULK_CHUNK_SIZE]
+            summaries = self._generate_bulk_chunk([employees[i] for i in chunk])
+            for i, summary in zip(chunk, summaries):
+                if summary is None:
+                    # Missing from the bulk answer: fall back to a single request
+                    explanations[i] = self.generate_explanation_openai(*employees[i])
+                else:
+                    explanations[i] = summary
+                    self._remember(keys[i], params[i], *employees[i], summary)
+        
+        return explanations
+    
+    def submit_batch(self, employees: List[Tuple[str, Dict[str, Any]]]) -> str:
+        """
+        Submit an offline OpenAI Batch API job for many employees
+        
+        Batch jobs cost half as much as regular requests and use a separate
+        rate-limit pool, at the price of up to 24h turnaround. Intended for
+        overnight roster reports.
+        
+        Args:
+            employees: list of (employee_name, results) pairs
+        
+        Returns:
+            batch id to pass to fetch_batch
+        """
+        if not self.use_openai:
+            raise RuntimeError("Batch jobs require an OpenAI API key")
+        
+        # One JSONL request per employee; custom_id is the input position
+        lines = [
+            json.dumps({
+                'custom_id': str(i),
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': self._chat_params(name, results)
+            })
+            for i, (name, results) in enumerate(employees)
+        ]
+        
+        batch_file = self.client.files.create(
+            file=('explanations.jsonl', '\n'.join(lines).encode()),
+            purpose='batch'
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        return batch.id
+    
+    def fetch_batch(self, batch_id: str) -> Optional[List[Optional[str]]]:
+        """
+        Collect the summaries of a job created with submit_batch
+        
+        Returns:
+            None while the job is still running, otherwise the summaries in
+            submission order (None for requests that failed)
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status in ('failed', 'expired', 'cancelled'):
+            raise RuntimeError(f"Batch {batch_id} ended with status '{batch.status}'")
+        if batch.status != 'completed':
+            return None
+        
+        summaries = {}
+        if batch.output_file_id:
+            output = self.client.files.content(batch.output_file_id)
+            for line in output.text.splitlines():
+                item = json.loads(line)
+                response = item.get('response')
+                if item.get('error') is None and response and response['status_code'] == 200:
+                    try:
+                        summaries[int(item['custom_id'])] = self._format_structured(
+                            response['body']['choices'][0]['message']['content']
+                        )
+                    except (ValueError, KeyError, TypeError):
+                        # Malformed answer: reported like a failed request
+                        pass
+        
+        return [summaries.get(i) for i in range(batch.request_counts.total)]
 
 
 if __name__ == '__main__':
@@ -1,6 +1,7 @@
-import SaludoCobos
-import SaludoDali
-import SaludoGlo
+from importlib import import_module
+
+# Módulos de saludo integrados, en orden de ejecución
+MODULOS_SALUDO = ("SaludoCobos", "SaludoDali", "SaludoGlo")
 
 if __name__ == "__main__":
     print("=" * 40)
@@ -8,9 +9,8 @@ if __name__ == "__main__":
     print("=" * 40)
     
     # Invocación de las funciones de cada módulo
-    SaludoCobos.saludo()
-    SaludoDali.saludo()
-    SaludoGlo.saludo()
+    for nombre in MODULOS_SALUDO:
+        import_module(nombre).saludo()
     
     print("=" * 40)
     print("--- DESPLIEGE FINALIZADO ---")
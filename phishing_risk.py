@@ -2,7 +2,73 @@
 Module 3: Risk Engine for Phishing Vulnerability Index
 Calculates employee vulnerability to phishing attacks based on stress and burnout
 """
+from bisect import bisect_right
+
 import numpy as np
+import pandas as pd
+
+from burnout_engine import _round_scores
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; without it the kernels below run as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+# Stress level (from StressLevelPredictor) mapped to a 0-100 risk score
+_STRESS_MAP = {'Low': 20, 'Medium': 45, 'High': 70, 'Critical': 95}
+
+# Vulnerability categories: category i covers [_VULNERABILITY_THRESHOLDS[i-1],
+# _VULNERABILITY_THRESHOLDS[i]), so bisect_right/searchsorted(side='right')
+# on the index gives the category position
+_VULNERABILITY_THRESHOLDS = (30, 50, 70)
+_RISK_LEVELS = ('Low Vulnerability', 'Moderate Vulnerability', 'High Vulnerability', 'Critical Vulnerability')
+_RISK_COLORS = ('green', 'yellow', 'orange', 'red')
+_RISK_RECOMMENDATIONS = (
+    'Maintain current security practices',
+    'Schedule security awareness refresher',
+    'Immediate security training required',
+    'Urgent intervention needed - high phishing risk'
+)
+
+
+@njit('float64(float64, float64, float64)', cache=True)
+def _cognitive_load(emails_per_day, meetings_per_week, task_complexity):
+    """Cognitive load kernel, see PhishingRiskEngine.calculate_cognitive_load"""
+    # Email overload
+    email_factor = min(100.0, max(0.0, (emails_per_day - 30) * 0.7))
+    
+    # Meeting fatigue
+    meeting_factor = min(100.0, max(0.0, (meetings_per_week - 5) * 3))
+    
+    # Task complexity
+    complexity_factor = task_complexity * 10
+    
+    # Combined cognitive load
+    score = email_factor * 0.4 + meeting_factor * 0.3 + complexity_factor * 0.3
+    
+    return min(100.0, max(0.0, score))
+
+
+@njit('float64(float64, float64, float64)', cache=True)
+def _awareness_vulnerability(work_hours, sleep_hours, work_life_balance):
+    """Awareness kernel, see PhishingRiskEngine.estimate_awareness_level"""
+    # Overwork reduces attention to security
+    overwork_factor = min(100.0, max(0.0, (work_hours - 40) * 2))
+    
+    # Sleep deprivation impairs judgment
+    sleep_factor = min(100.0, max(0.0, (7.5 - sleep_hours) * 12))
+    
+    # Poor work-life balance reduces security mindfulness
+    balance_factor = (10 - work_life_balance) * 10
+    
+    score = overwork_factor * 0.35 + sleep_factor * 0.35 + balance_factor * 0.30
+    
+    return min(100.0, max(0.0, score))
 
 
 class PhishingRiskEngine:
@@ -14,6 +80,9 @@ class PhishingRiskEngine:
             'cognitive_load': 0.25,
             'awareness_level': 0.20
         }
+        
+        # Weights in factor order, precomputed for the weighted sum
+        self._weight_values = tuple(self.risk_factors.values())
     
     def calculate_cognitive_load(self, emails_per_day, meetings_per_week, task_complexity):
         """
@@ -28,21 +97,7 @@ class PhishingRiskEngine:
         Returns:
             score 0-100
         """
-        # Email overload
-        email_factor = min(100, (emails_per_day - 30) * 0.7)
-        email_factor = max(0, email_factor)
-        
-        # Meeting fatigue
-        meeting_factor = min(100, (meetings_per_week - 5) * 3)
-        meeting_factor = max(0, meeting_factor)
-        
-        # Task complexity
-        complexity_factor = task_complexity * 10
-        
-        # Combined cognitive load
-        score = (email_factor * 0.4 + meeting_factor * 0.3 + complexity_factor * 0.3)
-        
-        return min(100, max(0, score))
+        return _cognitive_load(float(emails_per_day), float(meetings_per_week), float(task_complexity))
     
     def estimate_awareness_level(self, work_hours, sleep_hours, work_life_balance):
         """
@@ -57,19 +112,7 @@ class PhishingRiskEngine:
         Returns:
             score 0-100 (higher = less aware/more vulnerable)
         """
-        # Overwork reduces attention to security
-        overwork_factor = min(100, max(0, (work_hours - 40) * 2))
-        
-        # Sleep deprivation impairs judgment
-        sleep_factor = max(0, (7.5 - sleep_hours) * 12)
-        sleep_factor = min(100, sleep_factor)
-        
-        # Poor work-life balance reduces security mindfulness
-        balance_factor = (10 - work_life_balance) * 10
-        
-        score = (overwork_factor * 0.35 + sleep_factor * 0.35 + balance_factor * 0.30)
-        
-        return min(100, max(0, score))
+        return _awareness_vulnerability(float(work_hours), float(sleep_hours), float(work_life_balance))
     
     def calculate_vulnerability_index(self, employee_data, stress_result, burnout_result):
         """
@@ -84,8 +127,7 @@ class PhishingRiskEngine:
             dict with vulnerability index and risk factors
         """
         # Map stress level to score
-        stress_map = {'Low': 20, 'Medium': 45, 'High': 70, 'Critical': 95}
-        stress_score = stress_map.get(stress_result.get('stress_level', 'Medium'), 50)
+        stress_score = _STRESS_MAP.get(stress_result.get('stress_level', 'Medium'), 50)
         
         # Get burnout score
         burnout_score = burnout_result.get('total_score', 50)
@@ -105,30 +147,21 @@ class PhishingRiskEngine:
         )
         
         # Calculate weighted total
+        w_stress, w_burnout, w_cognitive, w_awareness = self._weight_values
+        stress_contribution = stress_score * w_stress
+        burnout_contribution = burnout_score * w_burnout
         vulnerability_index = (
-            stress_score * self.risk_factors['stress_level'] +
-            burnout_score * self.risk_factors['burnout_score'] +
-            cognitive_load * self.risk_factors['cognitive_load'] +
-            awareness_vulnerability * self.risk_factors['awareness_level']
+            stress_contribution +
+            burnout_contribution +
+            cognitive_load * w_cognitive +
+            awareness_vulnerability * w_awareness
         )
         
         # Categorize risk
-        if vulnerability_index < 30:
-            risk_level = 'Low Vulnerability'
-            color = 'green'
-            recommendation = 'Maintain current security practices'
-        elif vulnerability_index < 50:
-            risk_level = 'Moderate Vulnerability'
-            color = 'yellow'
-            recommendation = 'Schedule security awareness refresher'
-        elif vulnerability_index < 70:
-            risk_level = 'High Vulnerability'
-            color = 'orange'
-            recommendation = 'Immediate security training required'
-        else:
-            risk_level = 'Critical Vulnerability'
-            color = 'red'
-            recommendation = 'Urgent intervention needed - high phishing risk'
+        category = bisect_right(_VULNERABILITY_THRESHOLDS, vulnerability_index)
+        risk_level = _RISK_LEVELS[category]
+        color = _RISK_COLORS[category]
+        recommendation = _RISK_RECOMMENDATIONS[category]
         
         # Calculate attack success probability
         # Based on industry research: stressed employees 4x more likely to fall for phishing
@@ -143,13 +176,79 @@ class PhishingRiskEngine:
             'attack_success_probability': round(attack_success_probability * 100, 2),
             'recommendation': recommendation,
             'risk_factors': {
-                'stress_contribution': round(stress_score * self.risk_factors['stress_level'], 2),
-                'burnout_contribution': round(burnout_score * self.risk_factors['burnout_score'], 2),
+                'stress_contribution': round(stress_contribution, 2),
+                'burnout_contribution': round(burnout_contribution, 2),
                 'cognitive_load': round(cognitive_load, 2),
                 'awareness_vulnerability': round(awareness_vulnerability, 2)
             },
             'factor_weights': self.risk_factors
         }
+    
+    def calculate_vulnerability_index_batch(self, df, stress_levels, burnout_scores):
+        """
+        Calculate phishing vulnerability for many employees at once
+        
+        Args:
+            df: DataFrame with one row per employee and the metric columns
+                used by calculate_vulnerability_index
+            stress_levels: stress level per employee (from StressLevelPredictor)
+            burnout_scores: burnout total_score per employee (from BurnoutEngine)
+        
+        Returns:
+            DataFrame (same index) with the vulnerability index, its
+            categorization and the risk factor breakdown
+        """
+        stress_score = pd.Series(stress_levels).map(_STRESS_MAP).fillna(50).to_numpy(dtype=np.float64)
+        burnout_score = np.asarray(burnout_scores, dtype=np.float64)
+        
+        # Cognitive load
+        email_factor = np.clip((df['emails_per_day'].to_numpy(dtype=np.float64) - 30) * 0.7, 0, 100)
+        meeting_factor = np.clip((df['meetings_per_week'].to_numpy(dtype=np.float64) - 5) * 3, 0, 100)
+        complexity_factor = df['task_complexity'].to_numpy(dtype=np.float64) * 10
+        cognitive_load = np.clip(
+            email_factor * 0.4 + meeting_factor * 0.3 + complexity_factor * 0.3, 0, 100
+        )
+        
+        # Awareness level (vulnerability)
+        overwork_factor = np.clip((df['work_hours_per_week'].to_numpy(dtype=np.float64) - 40) * 2, 0, 100)
+        sleep_factor = np.clip((7.5 - df['sleep_hours_per_day'].to_numpy(dtype=np.float64)) * 12, 0, 100)
+        balance_factor = (10 - df['work_life_balance'].to_numpy(dtype=np.float64)) * 10
+        awareness_vulnerability = np.clip(
+            overwork_factor * 0.35 + sleep_factor * 0.35 + balance_factor * 0.30, 0, 100
+        )
+        
+        # Calculate weighted total, summed in the same order as the scalar
+        # version (a matmul reorders the additions and can flip a category)
+        w_stress, w_burnout, w_cognitive, w_awareness = self._weight_values
+        stress_contribution = stress_score * w_stress
+        burnout_contribution = burnout_score * w_burnout
+        vulnerability_index = (
+            stress_contribution +
+            burnout_contribution +
+            cognitive_load * w_cognitive +
+            awareness_vulnerability * w_awareness
+        )
+        
+        # Categorize risk (same lookup tables as the scalar version)
+        category = np.searchsorted(_VULNERABILITY_THRESHOLDS, vulnerability_index, side='right')
+        risk_level = np.take(_RISK_LEVELS, category)
+        color = np.take(_RISK_COLORS, category)
+        recommendation = np.take(_RISK_RECOMMENDATIONS, category)
+        
+        # Calculate attack success probability
+        attack_success_probability = np.minimum(0.95, 0.15 * (1 + (vulnerability_index / 100) * 3))
+        
+        return pd.DataFrame({
+            'vulnerability_index': _round_scores(vulnerability_index),
+            'risk_level': risk_level,
+            'color': color,
+            'attack_success_probability': _round_scores(attack_success_probability * 100),
+            'recommendation': recommendation,
+            'stress_contribution': _round_scores(stress_contribution),
+            'burnout_contribution': _round_scores(burnout_contribution),
+            'cognitive_load': _round_scores(cognitive_load),
+            'awareness_vulnerability': _round_scores(awareness_vulnerability)
+        }, index=df.index)
 
 
 if __name__ == '__main__':
@@ -2,56 +2,352 @@
 Module 1: RandomForest Model for Stress Level Prediction
 Predicts stress level based on employee metrics
 """
+from functools import lru_cache
 import pandas as pd
 import numpy as np
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
+from sklearn.tree._tree import Tree
 import joblib
 import os
+import pickle
+import threading
+import warnings
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    # Numba is optional; without it the forest is evaluated with NumPy
+    HAVE_NUMBA = False
+
+try:
+    # Optional: export trained forests to ONNX
+    from skl2onnx import to_onnx
+except ImportError:
+    to_onnx = None
+
+try:
+    # Optional: serve exported forests with ONNX Runtime
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+
+# Model input features, in the column order used for training
+FEATURE_NAMES = (
+    'work_hours_per_week',
+    'sleep_hours_per_day',
+    'meetings_per_week',
+    'emails_per_day',
+    'deadline_pressure',
+    'task_complexity',
+    'team_support',
+    'work_life_balance'
+)
+
+# Stress levels, from lowest to highest, and the synthetic stress score
+# upper bounds of all but the last (each bin includes its upper bound)
+STRESS_LEVELS = ('Low', 'Medium', 'High', 'Critical')
+_STRESS_SCORE_BINS = (20, 40, 60)
+
+# Forest size search: trees are added FOREST_GROWTH_STEP at a time up to
+# MAX_ESTIMATORS, and the smallest forest whose out-of-bag accuracy is within
+# OOB_TOLERANCE of the best one is kept
+MAX_ESTIMATORS = 100
+FOREST_GROWTH_STEP = 10
+OOB_TOLERANCE = 0.005
+
+# Largest-to-smallest class count ratio above which training reweights
+# classes inversely to their frequency, so the rare tails still count
+CLASS_IMBALANCE_RATIO = 3.0
+
+# Rows evaluated together by the NumPy forest descent (bounds its
+# rows x trees x classes temporaries)
+_PREDICT_CHUNK_ROWS = 4096
+
+# Batches at least this large spread prediction over all cores; smaller ones
+# run on the calling thread, where thread start-up would cost more than it saves
+PARALLEL_PREDICT_MIN_ROWS = 1000
+
+# Held while the parallel kernel runs: it already uses every core, and
+# Numba's workqueue threading layer (used when neither TBB nor OpenMP is
+# available) aborts the process if two threads launch parallel work at once
+_parallel_predict_lock = threading.Lock()
+
+# Training target encoding: stress level -> class index
+_CLASS_INDEX = {level: i for i, level in enumerate(STRESS_LEVELS)}
+
+
+def _stratified_split(y, test_size, seed):
+    """
+    Stratified train/test split of row indices
+    
+    Each class is shuffled with a seeded NumPy generator and test_size of
+    its rows go to the test set, so both sets keep the class balance.
+    
+    Returns:
+        (train_idx, test_idx) arrays
+    """
+    rng = np.random.default_rng(seed)
+    train_parts = []
+    test_parts = []
+    for label in np.unique(y):
+        rows = rng.permutation(np.flatnonzero(y == label))
+        n_test = int(round(len(rows) * test_size))
+        test_parts.append(rows[:n_test])
+        train_parts.append(rows[n_test:])
+    return np.concatenate(train_parts), np.concatenate(test_parts)
+
+
+def _pad_tree_classes(estimator, tree_classes, classes):
+    """
+    Widen a forest member's class columns to a larger set of classes
+    
+    Forests fit their trees on class indices, so a tree grown on data with
+    only some of the stress levels votes over fewer columns. Its node values
+    are copied to the columns of those levels and the others are left zero.
+    
+    Args:
+        estimator: fitted tree, modified in place
+        tree_classes: classes_ of the forest the tree was grown in
+        classes: classes_ of the forest it joins (a superset)
+    """
+    state = estimator.tree_.__getstate__()
+    values = np.zeros(state['values'].shape[:2] + (len(classes),))
+    values[:, :, np.searchsorted(classes, tree_classes)] = state['values']
+    
+    tree = Tree(estimator.n_features_in_, np.array([len(classes)], dtype=np.intp), estimator.n_outputs_)
+    tree.__setstate__({**state, 'values': values})
+    estimator.tree_ = tree
+    estimator.classes_ = np.arange(len(classes), dtype=np.float64)
+    estimator.n_classes_ = len(classes)
+
+
+def _flatten_forest(model):
+    """
+    Pack a fitted forest into flat per-field node arrays (SoA layout)
+    
+    Node i of a tree is stored at that tree's offset + i and child indices
+    are global, so every tree lives in the same few contiguous arrays.
+    Leaves point to themselves; 'value' holds each node's class
+    probabilities (only read at leaves), in model.classes_ order.
+    
+    Returns:
+        dict with 'roots', 'feature', 'threshold', 'left', 'right',
+        'value' arrays and the deepest tree's 'depth'
+    """
+    roots, features, thresholds, lefts, rights, values = [], [], [], [], [], []
+    offset = 0
+    depth = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        nodes = np.arange(offset, offset + tree.node_count)
+        is_leaf = tree.children_left == -1
+        
+        roots.append(offset)
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+        lefts.append(np.where(is_leaf, nodes, tree.children_left + offset))
+        rights.append(np.where(is_leaf, nodes, tree.children_right + offset))
+        
+        # Class counts -> probabilities, as DecisionTreeClassifier.predict_proba
+        value = tree.value[:, 0, :]
+        normalizer = value.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        values.append(value / normalizer)
+        
+        depth = max(depth, tree.max_depth)
+        offset += tree.node_count
+    
+    # Thresholds as float32, rounded down to the nearest float32: for float32
+    # inputs x, x <= t and x <= round_down(t) give the same answer, so half
+    # the threshold bytes change no prediction
+    threshold = np.concatenate(thresholds)
+    threshold32 = threshold.astype(np.float32)
+    rounded_up = threshold32 > threshold
+    threshold32[rounded_up] = np.nextafter(threshold32[rounded_up], np.float32(-np.inf))
+    
+    return {
+        'roots': np.array(roots, dtype=np.intp),
+        'feature': np.concatenate(features).astype(np.intp),
+        'threshold': threshold32,
+        'left': np.concatenate(lefts).astype(np.intp),
+        'right': np.concatenate(rights).astype(np.intp),
+        'value': np.concatenate(values).astype(np.float64),
+        'depth': depth
+    }
+
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _descend_row(x, roots, feature, threshold, left, right, value, out):
+        """Average the leaf probabilities of row x over the trees into out"""
+        n_trees = roots.shape[0]
+        n_classes = value.shape[1]
+        for t in range(n_trees):
+            node = roots[t]
+            while left[node] != node:
+                if x[feature[node]] <= threshold[node]:
+                    node = left[node]
+                else:
+                    node = right[node]
+            for c in range(n_classes):
+                out[c] += value[node, c]
+        for c in range(n_classes):
+            out[c] /= n_trees
+    
+    @njit(cache=True)
+    def _descend_forest(X, roots, feature, threshold, left, right, value):
+        """Class probabilities of rows X, on the calling thread"""
+        proba = np.zeros((X.shape[0], value.shape[1]))
+        for i in range(X.shape[0]):
+            _descend_row(X[i], roots, feature, threshold, left, right, value, proba[i])
+        return proba
+    
+    @njit(parallel=True, cache=True)
+    def _descend_forest_parallel(X, roots, feature, threshold, left, right, value):
+        """Class probabilities of rows X, one row per thread"""
+        proba = np.zeros((X.shape[0], value.shape[1]))
+        for i in prange(X.shape[0]):
+            _descend_row(X[i], roots, feature, threshold, left, right, value, proba[i])
+        return proba
+
+
+def _forest_predict_proba(forest, X):
+    """
+    Class probabilities of a flattened forest for rows X
+    
+    Matches RandomForestClassifier.predict_proba for float32 inputs (the
+    dtype scikit-learn's trees use): rows descend by the split thresholds
+    and the trees' leaf probabilities are averaged.
+    """
+    roots = forest['roots']
+    feature = forest['feature']
+    threshold = forest['threshold']
+    left = forest['left']
+    right = forest['right']
+    value = forest['value']
+    
+    if HAVE_NUMBA:
+        if len(X) < PARALLEL_PREDICT_MIN_ROWS:
+            return _descend_forest(X, roots, feature, threshold, left, right, value)
+        with _parallel_predict_lock:
+            return _descend_forest_parallel(X, roots, feature, threshold, left, right, value)
+    
+    # NumPy: all (row, tree) pairs step down one level at a time; rows that
+    # reached a leaf stay there, so `depth` steps finish every tree
+    proba = np.empty((len(X), value.shape[1]))
+    for start in range(0, len(X), _PREDICT_CHUNK_ROWS):
+        chunk = X[start:start + _PREDICT_CHUNK_ROWS]
+        rows = np.arange(len(chunk))[:, np.newaxis]
+        nodes = np.broadcast_to(roots, (len(chunk), len(roots)))
+        for _ in range(forest['depth']):
+            go_left = chunk[rows, feature[nodes]] <= threshold[nodes]
+            nodes = np.where(go_left, left[nodes], right[nodes])
+        proba[start:start + len(chunk)] = value[nodes].sum(axis=1) / len(roots)
+    return proba
+
+
+@lru_cache(maxsize=4)
+def _load_model_file(path, mtime):
+    """
+    Unpickle a saved model, once per file version
+    
+    Keyed by the modification time as well as the path, so a retrained
+    model is picked up. Instances loading the same file share the result.
+    """
+    return joblib.load(path, mmap_mode='r')
+
+
+def _replace_file(path, write):
+    """
+    Write a file through a temporary one in the same directory
+    
+    The finished file is renamed over path, so readers that memory-mapped
+    the previous version keep their (unlinked) copy intact instead of seeing
+    it rewritten under them.
+    
+    Args:
+        path: destination file
+        write: callable writing the contents to the temporary path it is given
+    """
+    # Unique per writer, so concurrent retrains never share a temporary file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 class StressLevelPredictor:
     def __init__(self, model_path='models/stress_model.pkl'):
         self.model_path = model_path
+        # Flattened forest used for prediction
+        self.forest = None
+        # scikit-learn forest, only kept in memory after training; saved
+        # separately for retraining and export
         self.model = None
-        self.label_encoder = LabelEncoder()
+        self.estimator_path = os.path.splitext(model_path)[0] + '_estimator.pkl'
+        # Stress level of each model.predict_proba column
+        self.classes = None
+        # Feature name -> importance of the current model, computed once
+        self.feature_importance = None
+        
+        # ONNX copy of the forest, saved beside the pickle, and its session
+        self.onnx_path = os.path.splitext(model_path)[0] + '.onnx'
+        self._ort = None
         
     def generate_training_data(self, n_samples=1000):
         """Generate synthetic training data for stress level prediction"""
-        np.random.seed(42)
-        
-        # Generate features
-        data = {
-            'work_hours_per_week': np.random.normal(45, 10, n_samples),
-            'sleep_hours_per_day': np.random.normal(7, 1.5, n_samples),
-            'meetings_per_week': np.random.randint(5, 30, n_samples),
-            'emails_per_day': np.random.randint(20, 150, n_samples),
-            'deadline_pressure': np.random.randint(1, 11, n_samples),  # 1-10 scale
-            'task_complexity': np.random.randint(1, 11, n_samples),  # 1-10 scale
-            'team_support': np.random.randint(1, 11, n_samples),  # 1-10 scale
-            'work_life_balance': np.random.randint(1, 11, n_samples),  # 1-10 scale
-        }
+        # Own PCG64 generator instead of reseeding the global legacy one
+        rng = np.random.default_rng(42)
         
-        df = pd.DataFrame(data)
+        # Generate features as raw arrays, integer ones directly in their
+        # storage dtype
+        work_hours = rng.normal(45, 10, n_samples)
+        sleep_hours = rng.normal(7, 1.5, n_samples)
+        meetings = rng.integers(5, 30, n_samples, dtype=np.int8)
+        emails = rng.integers(20, 150, n_samples, dtype=np.int16)  # too big for int8
+        deadline_pressure = rng.integers(1, 11, n_samples, dtype=np.int8)  # 1-10 scale
+        task_complexity = rng.integers(1, 11, n_samples, dtype=np.int8)  # 1-10 scale
+        team_support = rng.integers(1, 11, n_samples, dtype=np.int8)  # 1-10 scale
+        work_life_balance = rng.integers(1, 11, n_samples, dtype=np.int8)  # 1-10 scale
         
-        # Calculate stress level based on features
+        # Calculate stress level based on features, directly on the arrays
         stress_score = (
-            (df['work_hours_per_week'] - 40) * 0.5 +
-            (8 - df['sleep_hours_per_day']) * 5 +
-            df['meetings_per_week'] * 0.3 +
-            df['emails_per_day'] * 0.05 +
-            df['deadline_pressure'] * 3 +
-            df['task_complexity'] * 2 -
-            df['team_support'] * 2 -
-            df['work_life_balance'] * 2
+            (work_hours - 40) * 0.5 +
+            (8 - sleep_hours) * 5 +
+            meetings * 0.3 +
+            emails * 0.05 +
+            deadline_pressure * 3 +
+            task_complexity * 2 -
+            team_support * 2 -
+            work_life_balance * 2
         )
         
-        # Categorize into stress levels
-        df['stress_level'] = pd.cut(
-            stress_score, 
-            bins=[-np.inf, 20, 40, 60, np.inf],
-            labels=['Low', 'Medium', 'High', 'Critical']
+        # Store compact dtypes (the score above still uses the full-precision
+        # draws, so labels do not depend on the casts)
+        df = pd.DataFrame({
+            'work_hours_per_week': work_hours.astype(np.float32),
+            'sleep_hours_per_day': sleep_hours.astype(np.float32),
+            'meetings_per_week': meetings,
+            'emails_per_day': emails,
+            'deadline_pressure': deadline_pressure,
+            'task_complexity': task_complexity,
+            'team_support': team_support,
+            'work_life_balance': work_life_balance,
+        })
+        
+        # Categorize into stress levels: side='left' puts a score equal to a
+        # bound in the lower bin, and the codes index STRESS_LEVELS directly
+        df['stress_level'] = pd.Categorical.from_codes(
+            np.searchsorted(_STRESS_SCORE_BINS, stress_score, side='left'),
+            categories=STRESS_LEVELS,
+            ordered=True
         )
         
         return df
@@ -61,43 +357,264 @@ class StressLevelPredictor:
         if df is None:
             df = self.generate_training_data()
         
-        # Prepare features and target
-        X = df.drop('stress_level', axis=1)
-        y = self.label_encoder.fit_transform(df['stress_level'])
+        # Prepare features (as a plain float32 array in FEATURE_NAMES order,
+        # the dtype the tree builder works in) and target
+        X = df[list(FEATURE_NAMES)].to_numpy(dtype=np.float32)
+        y = df['stress_level'].map(_CLASS_INDEX).to_numpy(dtype=np.int8)
         
         # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42
-        )
+        train_idx, test_idx = _stratified_split(y, test_size=0.2, seed=42)
+        X_train, X_test = X[train_idx], X[test_idx]
+        y_train, y_test = y[train_idx], y[test_idx]
+        
+        # Only reweight when the classes are skewed. The weights are computed
+        # here, as 'balanced' would, because the presets are recomputed on
+        # every warm-started fit (scikit-learn warns about that)
+        class_counts = np.bincount(y_train)
+        present = np.flatnonzero(class_counts)
+        class_weight = None
+        if class_counts[present].max() > CLASS_IMBALANCE_RATIO * class_counts[present].min():
+            class_weight = {
+                int(c): float(len(y_train) / (len(present) * class_counts[c]))
+                for c in present
+            }
         
-        # Train model
+        # Train model, growing the forest while tracking its out-of-bag score
         self.model = RandomForestClassifier(
-            n_estimators=100,
+            n_estimators=FOREST_GROWTH_STEP,
             max_depth=10,
+            max_features='sqrt',
+            bootstrap=True,
+            oob_score=True,
+            warm_start=True,
+            class_weight=class_weight,
             random_state=42,
             n_jobs=-1
         )
-        self.model.fit(X_train, y_train)
+        oob_scores = []
+        with warnings.catch_warnings():
+            # Some rows land in every bootstrap sample (small forests, and
+            # class weights skew the draw towards the rare classes), which
+            # scikit-learn reports on every fit of the search
+            warnings.filterwarnings(
+                'ignore', message='Some inputs do not have OOB scores', category=UserWarning
+            )
+            for n_estimators in range(FOREST_GROWTH_STEP, MAX_ESTIMATORS + 1, FOREST_GROWTH_STEP):
+                self.model.set_params(n_estimators=n_estimators)
+                self.model.fit(X_train, y_train)
+                oob_scores.append(self.model.oob_score_)
+        
+        # Keep the smallest good-enough forest. Warm-started trees are seeded
+        # exactly like a fresh fit's, so the first n trees are the forest a
+        # fit with n_estimators=n would have built
+        best = max(oob_scores)
+        step = next(i for i, score in enumerate(oob_scores) if score >= best - OOB_TOLERANCE)
+        n_keep = (step + 1) * FOREST_GROWTH_STEP
+        self.model.estimators_ = self.model.estimators_[:n_keep]
+        self.model.oob_score_ = oob_scores[step]
+        del self.model.oob_decision_function_  # belonged to the full forest
+        self.model.set_params(n_estimators=n_keep, warm_start=False)
+        self.classes = np.asarray(STRESS_LEVELS)[self.model.classes_]
         
         # Calculate accuracy
         accuracy = self.model.score(X_test, y_test)
         
-        # Save model
-        os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-        joblib.dump({
-            'model': self.model,
-            'label_encoder': self.label_encoder,
-            'feature_names': X.columns.tolist()
-        }, self.model_path)
+        self._save_model(X_train)
         
         return accuracy
     
+    def partial_train(self, df, n_add_estimators=20):
+        """
+        Grow the trained forest with trees fitted on new data
+        
+        Existing trees are kept as they are; only the n_add_estimators new
+        ones are built, which is much cheaper than retraining from scratch.
+        df may cover only some of the stress levels (the new trees then give
+        the missing ones zero probability), but no level the model lacks.
+        
+        Args:
+            df: DataFrame with the FEATURE_NAMES columns and stress_level
+            n_add_estimators: number of trees to add
+        
+        Returns:
+            accuracy of the grown forest on a held-out part of df
+        """
+        if self.model is None:
+            if not os.path.exists(self.estimator_path):
+                raise FileNotFoundError(self.estimator_path)
+            # Loaded directly rather than through _load_model_file, since
+            # the estimator is modified in place below
+            self.model = joblib.load(self.estimator_path)
+        classes = np.asarray(STRESS_LEVELS)[self.model.classes_]
+        if self.classes is not None and not np.array_equal(classes, self.classes):
+            # e.g. a model saved with the old LabelEncoder class order
+            raise ValueError("Estimator classes do not match the loaded model; retrain with train()")
+        self.classes = classes
+        
+        X = df[list(FEATURE_NAMES)].to_numpy(dtype=np.float32)
+        y = df['stress_level'].map(_CLASS_INDEX).to_numpy(dtype=np.int8)
+        present = np.unique(y)
+        if not np.isin(present, self.model.classes_).all():
+            raise ValueError(
+                f"partial_train data may only contain the stress levels "
+                f"{self.classes.tolist()} the model was trained on"
+            )
+        
+        train_idx, test_idx = _stratified_split(y, test_size=0.2, seed=42)
+        X_train, X_test = X[train_idx], X[test_idx]
+        y_train, y_test = y[train_idx], y[test_idx]
+        
+        # The new trees are grown as a forest of their own, since the data
+        # may lack some stress levels, then widened to the stored classes
+        class_weight = self.model.class_weight
+        if isinstance(class_weight, dict):
+            class_weight = {c: w for c, w in class_weight.items() if c in present}
+        new_trees = clone(self.model).set_params(
+            n_estimators=n_add_estimators,
+            warm_start=False,
+            oob_score=False,
+            class_weight=class_weight,
+            # Offset, so repeated updates do not regrow the same trees
+            random_state=self.model.random_state + len(self.model.estimators_)
+        ).fit(X_train, y_train)
+        if len(new_trees.classes_) < len(self.model.classes_):
+            for estimator in new_trees.estimators_:
+                _pad_tree_classes(estimator, new_trees.classes_, self.model.classes_)
+        
+        # The out-of-bag score of the original fit does not carry over
+        self.model.estimators_ += new_trees.estimators_
+        self.model.set_params(n_estimators=len(self.model.estimators_), oob_score=False)
+        if hasattr(self.model, 'oob_score_'):
+            del self.model.oob_score_
+        
+        accuracy = self.model.score(X_test, y_test)
+        
+        self._save_model(X_train)
+        
+        return accuracy
+    
+    def _save_model(self, X_train):
+        """
+        Flatten the fitted self.model for serving and save both forms
+        
+        Args:
+            X_train: training features, used as the ONNX export sample
+        """
+        self.feature_importance = self._compute_feature_importance(self.model)
+        self.forest = _flatten_forest(self.model)
+        
+        # Save the flattened forest uncompressed, so its arrays can be
+        # memory-mapped on load; the sklearn forest goes to its own file
+        os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
+        _replace_file(self.estimator_path, lambda path: joblib.dump(
+            self.model, path, compress=0, protocol=pickle.HIGHEST_PROTOCOL
+        ))
+        saved = {
+            'forest': self.forest,
+            'classes': self.classes,
+            'feature_names': list(FEATURE_NAMES),
+            'feature_importance': self.feature_importance
+        }
+        _replace_file(self.model_path, lambda path: joblib.dump(
+            saved, path, compress=0, protocol=pickle.HIGHEST_PROTOCOL
+        ))
+        self._export_onnx(X_train)
+    
+    @staticmethod
+    def _compute_feature_importance(model):
+        """
+        Feature importances of a fitted forest
+        
+        model.feature_importances_ averages over every tree on each access,
+        so predictions reuse this result instead.
+        """
+        return dict(zip(FEATURE_NAMES, model.feature_importances_.tolist()))
+    
+    def _export_onnx(self, X_train):
+        """
+        Save an ONNX copy of the freshly trained forest (needs skl2onnx)
+        
+        Any earlier export is removed first, since it no longer matches the
+        pickled model.
+        """
+        self._ort = None
+        if os.path.exists(self.onnx_path):
+            os.remove(self.onnx_path)
+        if to_onnx is None:
+            return
+        
+        # zipmap=False: probabilities come back as an (n, n_classes) array,
+        # in model.classes_ order like predict_proba
+        try:
+            onnx_model = to_onnx(
+                self.model,
+                X_train[:1].astype(np.float32),
+                options={id(self.model): {'zipmap': False}}
+            )
+        except RuntimeError as e:
+            # e.g. a forest type skl2onnx has no converter for
+            print(f"ONNX export skipped: {e}")
+            return
+        serialized = onnx_model.SerializeToString()
+        
+        def write(path):
+            with open(path, 'wb') as f:
+                f.write(serialized)
+        
+        _replace_file(self.onnx_path, write)
+        self._load_onnx()
+    
+    def _load_onnx(self):
+        """Open an ONNX Runtime session on the export, if usable"""
+        self._ort = None
+        if onnxruntime is None or not os.path.exists(self.onnx_path):
+            return
+        if os.path.getmtime(self.onnx_path) < os.path.getmtime(self.model_path):
+            # Exported from an older model than the pickle
+            return
+        
+        self._ort = onnxruntime.InferenceSession(self.onnx_path, providers=['CPUExecutionProvider'])
+        self._ort_input = self._ort.get_inputs()[0].name
+        self._ort_probabilities = self._ort.get_outputs()[1].name
+    
+    def _predict_proba(self, X):
+        """
+        Class probabilities for rows in FEATURE_NAMES order
+        
+        Uses the ONNX Runtime session when one is loaded, otherwise the
+        flattened forest. Columns follow self.classes either way.
+        """
+        if self._ort is not None:
+            return self._ort.run(
+                [self._ort_probabilities],
+                {self._ort_input: np.ascontiguousarray(X, dtype=np.float32)}
+            )[0]
+        
+        return _forest_predict_proba(self.forest, np.asarray(X, dtype=np.float32))
+    
     def load_model(self):
         """Load the trained model"""
         if os.path.exists(self.model_path):
-            model_data = joblib.load(self.model_path)
-            self.model = model_data['model']
-            self.label_encoder = model_data['label_encoder']
+            # Arrays are mapped read-only from the file instead of copied,
+            # and workers loading the same file share its page cache
+            model_data = _load_model_file(self.model_path, os.path.getmtime(self.model_path))
+            if 'forest' in model_data:
+                self.forest = model_data['forest']
+            else:
+                # Saved before forests were flattened: the file holds the
+                # scikit-learn forest itself
+                self.model = model_data['model']
+                self.forest = _flatten_forest(self.model)
+            if 'classes' in model_data:
+                self.classes = model_data['classes']
+            else:
+                # Saved before the classes were stored: use its LabelEncoder
+                self.classes = model_data['label_encoder'].classes_
+            if 'feature_importance' in model_data:
+                self.feature_importance = model_data['feature_importance']
+            else:
+                self.feature_importance = self._compute_feature_importance(model_data['model'])
+            self._load_onnx()
             return True
         return False
     
@@ -106,40 +623,96 @@ class StressLevelPredictor:
         Predict stress level for given features
         
         Args:
-            features: dict with keys matching training features
+            features: dict with keys matching training features, or a
+                list/NumPy array of the values in FEATURE_NAMES order
         
         Returns:
             dict with prediction and probability
         """
-        if self.model is None:
+        # float32 is what the trees compare against, so no conversion copy
+        if isinstance(features, dict):
+            row = np.empty((1, len(FEATURE_NAMES)), dtype=np.float32)
+            for i, name in enumerate(FEATURE_NAMES):
+                row[0, i] = features[name]
+        else:
+            row = np.asarray(features, dtype=np.float32).reshape(1, -1)
+            if row.shape[1] != len(FEATURE_NAMES):
+                raise ValueError(f"Expected {len(FEATURE_NAMES)} feature values, got {row.shape[1]}")
+        return self.predict_vec(row)
+    
+    def predict_vec(self, row):
+        """
+        Predict stress level for a feature row already in FEATURE_NAMES order
+        
+        Callers that already hold the features as an array skip the
+        per-key dict lookups of predict().
+        
+        Args:
+            row: NumPy array of shape (1, len(FEATURE_NAMES)), ideally float32
+        
+        Returns:
+            dict with prediction and probability
+        """
+        if self.forest is None:
             if not self.load_model():
                 raise ValueError("Model not trained or loaded")
         
-        # Convert to DataFrame
-        df = pd.DataFrame([features])
-        
-        # Predict
-        prediction_encoded = self.model.predict(df)[0]
-        probabilities = self.model.predict_proba(df)[0]
+        # Predict (argmax of the probabilities is what model.predict returns)
+        probabilities = self._predict_proba(row)[0]
         
         # Decode prediction
-        prediction = self.label_encoder.inverse_transform([prediction_encoded])[0]
-        
-        # Get feature importance
-        feature_importance = dict(zip(
-            df.columns,
-            self.model.feature_importances_
-        ))
+        prediction = self.classes[probabilities.argmax()]
         
         return {
             'stress_level': prediction,
             'confidence': float(max(probabilities)),
             'probabilities': {
                 level: float(prob) 
-                for level, prob in zip(self.label_encoder.classes_, probabilities)
+                for level, prob in zip(self.classes, probabilities)
             },
-            'feature_importance': feature_importance
+            'feature_importance': self.feature_importance
         }
+    
+    def predict_batch(self, features_list):
+        """
+        Predict stress levels for many employees with one model call
+        
+        Args:
+            features_list: list of feature dicts (or a DataFrame)
+        
+        Returns:
+            list of dicts shaped like predict() results, in input order
+        """
+        if self.forest is None:
+            if not self.load_model():
+                raise ValueError("Model not trained or loaded")
+        
+        # Stack into a float32 array in the column order used for training;
+        # plain lists skip building a DataFrame
+        if isinstance(features_list, pd.DataFrame):
+            X = features_list[list(FEATURE_NAMES)].to_numpy(dtype=np.float32)
+        else:
+            X = np.array(
+                [[features[name] for name in FEATURE_NAMES] for features in features_list],
+                dtype=np.float32
+            ).reshape(-1, len(FEATURE_NAMES))
+        
+        # Predict (argmax of the probabilities is what model.predict returns)
+        probabilities = self._predict_proba(X)
+        predictions = self.classes[probabilities.argmax(axis=1)]
+        
+        return [
+            {
+                'stress_level': prediction,
+                'confidence': float(max(probs)),
+                'probabilities': {
+                    level: float(prob)
+                    for level, prob in zip(self.classes, probs)
+                },
+                'feature_importance': self.feature_importance
+            }
+            for prediction, probs in zip(predictions, probabilities)
+        ]
 
 
 if __name__ == '__main__':
@@ -0,0 +1,97 @@
+"""
+Batch engine methods must give exactly the results of their scalar versions
+(the API returns the scalar ones from /api/analyze and the batch ones from
+/api/analyze_batch)
+
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from burnout_engine import BurnoutEngine
+from phishing_risk import PhishingRiskEngine
+
+
+N_EMPLOYEES = 20000
+STRESS_LEVELS = ['Low', 'Medium', 'High', 'Critical']
+
+
+def random_employees(n, seed=0):
+    """Random employee metrics, in the types the app parses them to"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'work_hours_per_week': rng.integers(60, 140, n) * 0.5,
+        'sleep_hours_per_day': rng.integers(8, 20, n) * 0.5,
+        'meetings_per_week': rng.integers(0, 40, n),
+        'emails_per_day': rng.integers(0, 200, n),
+        'deadline_pressure': rng.integers(1, 11, n),
+        'task_complexity': rng.integers(1, 11, n),
+        'team_support': rng.integers(1, 11, n),
+        'work_life_balance': rng.integers(1, 11, n),
+        'stress_level': rng.choice(STRESS_LEVELS, n)
+    })
+
+
+class BurnoutBatchParityTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = BurnoutEngine()
+
+    def assert_batch_matches(self, df):
+        batch = self.engine.calculate_burnout_score_batch(df).to_dict('records')
+        for employee, batch_row in zip(df.to_dict('records'), batch):
+            scalar = self.engine.calculate_burnout_score(employee)
+            for name in ('total_score', 'level', 'color'):
+                self.assertEqual(scalar[name], batch_row[name], (employee, name))
+            for name in self.engine.weights:
+                self.assertEqual(scalar['components'][name], batch_row[name], (employee, name))
+
+    def test_matches_scalar(self):
+        self.assert_batch_matches(random_employees(N_EMPLOYEES))
+
+    def test_rounding_of_example(self):
+        # 56.19 from the scalar path, 56.18 with np.round
+        self.assert_batch_matches(pd.DataFrame([{
+            'work_hours_per_week': 55.0,
+            'sleep_hours_per_day': 5.5,
+            'meetings_per_week': 25,
+            'emails_per_day': 120,
+            'deadline_pressure': 9,
+            'task_complexity': 8,
+            'team_support': 3,
+            'work_life_balance': 2,
+            'stress_level': 'High'
+        }]))
+
+
+class PhishingBatchParityTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = PhishingRiskEngine()
+
+    def test_matches_scalar(self):
+        df = random_employees(N_EMPLOYEES)
+        # Burnout totals as BurnoutEngine reports them (2 decimals)
+        burnout_scores = np.random.default_rng(1).integers(0, 10001, len(df)) / 100
+        batch = self.engine.calculate_vulnerability_index_batch(
+            df, df['stress_level'], burnout_scores
+        ).to_dict('records')
+
+        for employee, burnout_score, batch_row in zip(df.to_dict('records'), burnout_scores.tolist(), batch):
+            scalar = self.engine.calculate_vulnerability_index(
+                employee,
+                {'stress_level': employee['stress_level']},
+                {'total_score': burnout_score}
+            )
+            for name in ('vulnerability_index', 'risk_level', 'color', 'attack_success_probability', 'recommendation'):
+                self.assertEqual(scalar[name], batch_row[name], (employee, burnout_score, name))
+            for name, value in scalar['risk_factors'].items():
+                self.assertEqual(value, batch_row[name], (employee, burnout_score, name))
+
+
+if __name__ == '__main__':
+    unittest.main()
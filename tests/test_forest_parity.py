@@ -0,0 +1,83 @@
+"""
+The flattened forest must give exactly the probabilities of the scikit-learn
+forest it was built from, with and without Numba (the API serves predictions
+from the flattened copy)
+
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import stress_predictor
+from stress_predictor import FEATURE_NAMES, StressLevelPredictor, _flatten_forest, _forest_predict_proba
+
+
+N_TREES = 30
+N_RANDOM_ROWS = 5000
+
+
+class ForestParityTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        df = StressLevelPredictor().generate_training_data(2000)
+        X = df[list(FEATURE_NAMES)].to_numpy(dtype=np.float32)
+        cls.model = RandomForestClassifier(
+            n_estimators=N_TREES, max_depth=10, random_state=0
+        ).fit(X, df['stress_level'])
+        cls.forest = _flatten_forest(cls.model)
+
+        rng = np.random.default_rng(0)
+        low, high = X.min(axis=0), X.max(axis=0)
+        cls.random_rows = rng.uniform(low, high, (N_RANDOM_ROWS, len(FEATURE_NAMES))).astype(np.float32)
+
+        # One row per split with that split's feature set to the float32
+        # threshold (nearest and rounded down) or to the float32 right above it
+        features, thresholds = [], []
+        for estimator in cls.model.estimators_:
+            tree = estimator.tree_
+            split = tree.children_left != -1
+            features.append(tree.feature[split])
+            thresholds.append(tree.threshold[split])
+        features = np.concatenate(features)
+        thresholds = np.concatenate(thresholds)
+        nearest = thresholds.astype(np.float32)
+        rounded_down = np.where(nearest > thresholds, np.nextafter(nearest, np.float32(-np.inf)), nearest)
+
+        rows = []
+        for values in (nearest, rounded_down):
+            for candidate in (values, np.nextafter(values, np.float32(np.inf))):
+                block = cls.random_rows[rng.integers(0, N_RANDOM_ROWS, len(features))]
+                block[np.arange(len(features)), features] = candidate
+                rows.append(block)
+        cls.threshold_rows = np.concatenate(rows)
+
+    def assert_matches_sklearn(self, X):
+        expected = self.model.predict_proba(X)
+        # (path, HAVE_NUMBA, PARALLEL_PREDICT_MIN_ROWS)
+        paths = [('numpy', False, 1)]
+        if stress_predictor.HAVE_NUMBA:
+            paths += [('numba', True, len(X) + 1), ('numba parallel', True, 1)]
+        for path, have_numba, parallel_min_rows in paths:
+            with self.subTest(path=path), \
+                    mock.patch.object(stress_predictor, 'HAVE_NUMBA', have_numba), \
+                    mock.patch.object(stress_predictor, 'PARALLEL_PREDICT_MIN_ROWS', parallel_min_rows):
+                np.testing.assert_allclose(
+                    _forest_predict_proba(self.forest, X), expected, rtol=0, atol=1e-12
+                )
+
+    def test_random_rows(self):
+        self.assert_matches_sklearn(self.random_rows)
+
+    def test_rows_on_thresholds(self):
+        self.assert_matches_sklearn(self.threshold_rows)
+
+
+if __name__ == '__main__':
+    unittest.main()